@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from backend.app.services.transcript import CHUNK_BOUNDARIES, CHUNK_OVERLAP_POLICIES
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
 
@@ -13,5 +15,37 @@ LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama").strip().lower()
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "").strip()
 
+# Transcript chunking (see chunk_text in backend/app/services/transcript.py).
+# CHUNK_MAX_TOKENS > 0 switches from character to estimated-token sizing, capped to
+# the embedding model's context window; CHUNK_OVERLAP is then counted in tokens too
+# and defaults to a fifth of a chunk.
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "0"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", CHUNK_MAX_TOKENS // 5 if CHUNK_MAX_TOKENS > 0 else 200))
+CHUNK_BOUNDARY = os.getenv("CHUNK_BOUNDARY", "size").strip().lower()
+CHUNK_OVERLAP_POLICY = os.getenv("CHUNK_OVERLAP_POLICY", "fixed").strip().lower()
+CHUNK_PAUSE_SECONDS = float(os.getenv("CHUNK_PAUSE_SECONDS", "1.0"))
+
+if CHUNK_BOUNDARY not in CHUNK_BOUNDARIES:
+    raise ValueError(f"CHUNK_BOUNDARY must be one of {', '.join(CHUNK_BOUNDARIES)}, got {CHUNK_BOUNDARY!r}.")
+if CHUNK_OVERLAP_POLICY not in CHUNK_OVERLAP_POLICIES:
+    raise ValueError(
+        f"CHUNK_OVERLAP_POLICY must be one of {', '.join(CHUNK_OVERLAP_POLICIES)}, got {CHUNK_OVERLAP_POLICY!r}."
+    )
+
+# Vectorstore snapshots (see backend/app/services/retriever.py).
+# Older snapshots are kept so in-flight readers can finish; compaction starts once
+# this fraction of chunks has been deleted.
+SNAPSHOT_RETENTION = int(os.getenv("SNAPSHOT_RETENTION", "2"))
+COMPACTION_THRESHOLD = float(os.getenv("COMPACTION_THRESHOLD", "0.2"))
+
+# Optional dedicated search process (see backend/app/services/search_server.py).
+# When SEARCH_SOCKET is set, API workers forward searches to it instead of loading
+# the FAISS index themselves.
+SEARCH_SOCKET = os.getenv("SEARCH_SOCKET", "").strip()
+SEARCH_BATCH_WINDOW_MS = float(os.getenv("SEARCH_BATCH_WINDOW_MS", "2"))
+SEARCH_MAX_BATCH = int(os.getenv("SEARCH_MAX_BATCH", "64"))
+SEARCH_MMAP = os.getenv("SEARCH_MMAP", "false").strip().lower() in ("1", "true", "yes")
+
 # Ensure vectorstore dir exists
 VECTORSTORE_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
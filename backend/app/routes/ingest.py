@@ -1,5 +1,14 @@
 import asyncio
 from fastapi import APIRouter, Query
+from backend.app.config import (
+    CHUNK_BOUNDARY,
+    CHUNK_MAX_TOKENS,
+    CHUNK_OVERLAP,
+    CHUNK_OVERLAP_POLICY,
+    CHUNK_PAUSE_SECONDS,
+    CHUNK_SIZE,
+)
+from backend.app.services.embeddings import embed_token_limit
 from backend.app.services.transcript import fetch_transcript_data, chunk_text
 from backend.app.services.retriever import save_vectorstore
 
@@ -30,7 +39,17 @@ async def ingest_video(video_url: str = Query(..., description="YouTube video UR
 
     # Step 1 — Chunk the transcript into timestamped chunks (if segments available)
     segments = transcript_data.get("segments", [])
-    chunks = chunk_text(transcript, chunk_size=1000, overlap=200, segments=segments)
+    max_tokens = min(CHUNK_MAX_TOKENS, embed_token_limit()) if CHUNK_MAX_TOKENS > 0 else None
+    chunks = chunk_text(
+        transcript,
+        chunk_size=CHUNK_SIZE,
+        overlap=CHUNK_OVERLAP,
+        segments=segments,
+        max_tokens=max_tokens,
+        boundary=CHUNK_BOUNDARY,
+        overlap_policy=CHUNK_OVERLAP_POLICY,
+        pause_seconds=CHUNK_PAUSE_SECONDS,
+    )
 
     # Step 2 — Save chunks to FAISS
     try:
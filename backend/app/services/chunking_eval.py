@@ -0,0 +1,129 @@
+"""Offline comparison of transcript chunking strategies.
+
+For every fixture transcript and strategy, chunks the cues, embeds them and builds
+an in-memory FAISS index, then reports index size, ingest time and retrieval hit
+rate. A question counts as a hit when one of the top-k chunks spans its `time`.
+Fixtures that a strategy splits into top-k chunks or fewer are left out of its
+hit rate, since retrieving every chunk would score 100% regardless of quality.
+Nothing is written to VECTORSTORE_DIR. Requires Ollama for embeddings.
+
+Fixtures are JSON files of the form
+    {"title": ..., "segments": [{"start", "end", "text"}, ...],
+     "questions": [{"question": ..., "time": seconds}, ...]}
+
+Usage (from the repo root):
+    python -m backend.app.services.chunking_eval [--fixtures DIR] [--top-k 4]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from backend.app.config import BASE_DIR
+from backend.app.services.embeddings import embed_token_limit, get_embedding
+from backend.app.services.retriever import build_index
+from backend.app.services.transcript import chunk_text
+
+FIXTURES_DIR = BASE_DIR / "fixtures" / "transcripts"
+
+# keyword arguments passed to chunk_text for each strategy
+STRATEGIES = {
+    "chars-1000-overlap-200": {"chunk_size": 1000, "overlap": 200},
+    "chars-1000-no-overlap": {"chunk_size": 1000, "overlap": 0, "overlap_policy": "none"},
+    "tokens-128-sentence": {"max_tokens": 128, "overlap": 0, "boundary": "sentence", "overlap_policy": "none"},
+    "tokens-128-sentence-overlap": {"max_tokens": 128, "overlap": 32, "boundary": "sentence", "overlap_policy": "boundary"},
+    "tokens-256-sentence-overlap": {"max_tokens": 256, "overlap": 48, "boundary": "sentence", "overlap_policy": "boundary"},
+}
+
+
+def load_fixtures(fixtures_dir: Path) -> list[dict]:
+    fixtures = []
+    for path in sorted(fixtures_dir.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            fixtures.append(json.load(f))
+    if not fixtures:
+        raise SystemExit(f"No fixture transcripts found in {fixtures_dir}")
+    return fixtures
+
+
+def evaluate_strategy(options: dict, fixtures: list[dict], top_k: int, query_cache: dict) -> dict:
+    if options.get("max_tokens"):
+        options = {**options, "max_tokens": min(options["max_tokens"], embed_token_limit())}
+
+    chunk_count = 0
+    index_bytes = 0
+    ingest_seconds = 0.0
+    hits = 0
+    questions = 0
+    too_small = []
+
+    for fixture in fixtures:
+        segments = fixture["segments"]
+        transcript = " ".join(segment["text"] for segment in segments)
+
+        started = time.perf_counter()
+        chunks = chunk_text(transcript, segments=segments, **options)
+        index = build_index(chunks)
+        ingest_seconds += time.perf_counter() - started
+
+        chunk_count += len(chunks)
+        index_bytes += faiss.serialize_index(index).nbytes
+
+        if top_k >= len(chunks):
+            too_small.append(fixture.get("title", "untitled"))
+            continue
+
+        for item in fixture.get("questions", []):
+            question = item["question"]
+            if question not in query_cache:
+                query_cache[question] = get_embedding(question)
+            query_vec = np.array([query_cache[question]], dtype="float32")
+            _, indices = index.search(query_vec, top_k)
+
+            questions += 1
+            for i in indices[0]:
+                if 0 <= i < len(chunks) and chunks[i]["start"] <= item["time"] <= chunks[i]["end"]:
+                    hits += 1
+                    break
+
+    return {
+        "chunks": chunk_count,
+        "index_kb": index_bytes / 1024,
+        "ingest_s": ingest_seconds,
+        "hit_rate": hits / questions if questions else None,
+        "too_small": too_small,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transcript chunking strategies.")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Directory of fixture transcript JSON files")
+    parser.add_argument("--top-k", type=int, default=4, help="Chunks retrieved per question (query route uses 4)")
+    parser.add_argument("--strategy", action="append", choices=sorted(STRATEGIES), help="Only run these strategies")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    query_cache: dict = {}
+
+    print(f"{'strategy':<30} {'chunks':>7} {'index KB':>9} {'ingest s':>9} {'hit rate':>9}")
+    for name in args.strategy or STRATEGIES:
+        result = evaluate_strategy(STRATEGIES[name], fixtures, args.top_k, query_cache)
+        hit_rate = "n/a" if result["hit_rate"] is None else f"{result['hit_rate']:.0%}"
+        print(
+            f"{name:<30} {result['chunks']:>7} {result['index_kb']:>9.1f} "
+            f"{result['ingest_s']:>9.2f} {hit_rate:>9}"
+        )
+        if result["too_small"]:
+            print(
+                f"warning: {name} produced top-k ({args.top_k}) chunks or fewer for "
+                f"{', '.join(result['too_small'])}; excluded from its hit rate",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    main()
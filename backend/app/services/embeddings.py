@@ -4,6 +4,23 @@ import requests
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")  # ollama pull nomic-embed-text
 
+# Context windows (in tokens) Ollama serves common embedding models with.
+# Unknown models fall back to a conservative 512.
+EMBED_CONTEXT_TOKENS = {
+    "nomic-embed-text": 2048,
+    "mxbai-embed-large": 512,
+    "snowflake-arctic-embed": 512,
+    "all-minilm": 256,
+    "bge-m3": 8192,
+}
+
+def embed_token_limit(model: str | None = None) -> int:
+    """
+    Return the context window of the embedding model, ignoring any ':tag' suffix.
+    """
+    name = (model or EMBED_MODEL).split(":", 1)[0]
+    return EMBED_CONTEXT_TOKENS.get(name, 512)
+
 def get_embedding(text: str):
     """
     Generate embeddings for text using Ollama embedding models.
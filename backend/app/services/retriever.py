@@ -1,52 +1,428 @@
+import fcntl
+import hashlib
+import json
+import logging
 import os
+import shutil
+import tempfile
+import threading
+import time
 import faiss
 import numpy as np
 import pickle
+import re
+import secrets
+from contextlib import contextmanager
+from multiprocessing.connection import Client
 from pathlib import Path
 from .embeddings import get_embedding
-from backend.app.config import VECTORSTORE_DIR  # <-- changed
+from backend.app.config import (  # <-- changed
+    COMPACTION_THRESHOLD,
+    SEARCH_SOCKET,
+    SNAPSHOT_RETENTION,
+    VECTORSTORE_DIR,
+)
 
-INDEX_FILE = VECTORSTORE_DIR / "faiss.index"
-MAPPING_FILE = VECTORSTORE_DIR / "mapping.pkl"
+# Each ingest writes an immutable snapshot directory under SNAPSHOTS_DIR and then
+# atomically replaces MANIFEST_FILE, which names the current snapshot and the
+# checksums of its files. A crash mid-write leaves the previous manifest intact.
+MANIFEST_FILE = VECTORSTORE_DIR / "manifest.json"
+SNAPSHOTS_DIR = VECTORSTORE_DIR / "snapshots"
+LOCK_FILE = VECTORSTORE_DIR / ".lock"
+INDEX_NAME = "faiss.index"
+MAPPING_NAME = "mapping.pkl"
+# <8-digit version>[-<hex suffix>]; unsuffixed names come from older publishes
+SNAPSHOT_NAME = re.compile(r"^(\d{8})(-[0-9a-f]+)?$")
+
+# pre-snapshot layout, still readable when no manifest exists
+INDEX_FILE = VECTORSTORE_DIR / INDEX_NAME
+MAPPING_FILE = VECTORSTORE_DIR / MAPPING_NAME
+
+# IO_FLAG_MMAP only maps IVF inverted lists; flat indexes need the zero-copy
+# IO_FLAG_MMAP_IFC. Faiss builds without it can only read the index into memory.
+_MMAP_IO_FLAG = getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+
+logger = logging.getLogger(__name__)
 
 # ensure directory exists
 VECTORSTORE_DIR.mkdir(parents=True, exist_ok=True)
+SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 
-def save_vectorstore(texts: list[str]):
+class VectorSnapshot:
+    """
+    A consistent, read-only view of one vectorstore version.
+    Queries hold on to a snapshot, so a concurrent ingest never changes what they see.
+    """
+
+    def __init__(self, version: int, name: str | None, index, texts: list, deleted: set[int] | None = None):
+        self.version = version
+        self.name = name
+        self.index = index
+        self.texts = texts
+        self.deleted = deleted or set()
+
+    def search(self, query_vecs: np.ndarray, top_k: int) -> list[list]:
+        """
+        Return the top_k live items for each query vector, skipping deleted chunks.
+        """
+        k = min(top_k + len(self.deleted), self.index.ntotal)
+        if k <= 0:
+            return [[] for _ in range(len(query_vecs))]
+        distances, indices = self.index.search(query_vecs, k)
+        return [self._collect_results(row, top_k) for row in indices]
+
+    def _collect_results(self, indices, top_k: int) -> list:
+        results = []
+        for i in indices:
+            if 0 <= i < len(self.texts) and i not in self.deleted:
+                results.append(self.texts[i])
+                if len(results) == top_k:
+                    break
+        return results
+
+class SnapshotCorruptError(RuntimeError):
+    """A snapshot file is missing or does not match its manifest checksum."""
+
+_snapshot_lock = threading.Lock()
+_snapshot_cache: dict[bool, VectorSnapshot] = {}
+# mmap flags with a snapshot load in progress
+_snapshot_loading: set[bool] = set()
+
+@contextmanager
+def _writer_lock():
+    """Serialize writers across threads and processes sharing VECTORSTORE_DIR."""
+    with open(LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _fsync_dir(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_durable(path: Path, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return hashlib.sha256(data).hexdigest()
+
+def _read_manifest() -> dict | None:
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _write_manifest(manifest: dict):
+    fd, tmp_path = tempfile.mkstemp(prefix=".manifest-", dir=VECTORSTORE_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(manifest, indent=2).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, MANIFEST_FILE)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _fsync_dir(VECTORSTORE_DIR)
+
+def _remove_entry(path: Path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+def _prune_snapshots(manifest: dict):
+    """Remove crash leftovers and all but the newest SNAPSHOT_RETENTION snapshots."""
+    snapshot_dirs = sorted(p for p in SNAPSHOTS_DIR.iterdir() if p.is_dir() and SNAPSHOT_NAME.match(p.name))
+    keep = {p.name for p in snapshot_dirs[-max(1, SNAPSHOT_RETENTION):]}
+    keep.add(manifest["snapshot"])
+    if manifest.get("previous"):
+        keep.add(manifest["previous"]["snapshot"])
+    for path in SNAPSHOTS_DIR.iterdir():
+        if path.name not in keep:
+            _remove_entry(path)
+
+def _remove_orphans(current_version: int):
     """
-    Build FAISS index for given texts and persist it to disk.
+    Remove snapshot directories newer than the manifest. They were renamed into place
+    by a publish that crashed before swapping the manifest, so nothing references them.
+    Entries that are not snapshots at all are dropped too, as _prune_snapshots does.
+    """
+    for path in SNAPSHOTS_DIR.iterdir():
+        if path.name.startswith("."):
+            continue
+        match = SNAPSHOT_NAME.match(path.name)
+        if match is None or int(match.group(1)) > current_version:
+            _remove_entry(path)
+
+def _publish_snapshot(index, texts: list, base_version: int | None = None) -> int | None:
+    """
+    Write index and mapping to a new snapshot directory and make it current.
+    With `base_version`, publish only if the current version is still base_version
+    and return None otherwise, so a stale compaction never overwrites a newer ingest.
+    """
+    index_bytes = faiss.serialize_index(index).tobytes()
+    # persist the original items (strings or dicts) so we can return metadata later
+    mapping_bytes = pickle.dumps(texts)
+
+    with _writer_lock():
+        current = _read_manifest()
+        current_version = current["version"] if current else 0
+        if base_version is not None and current_version != base_version:
+            return None
+
+        _remove_orphans(current_version)
+        version = current_version + 1
+        # the random suffix keeps a leftover directory from ever blocking the rename
+        name = f"{version:08d}-{secrets.token_hex(4)}"
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=SNAPSHOTS_DIR))
+        try:
+            index_sha = _write_durable(tmp_dir / INDEX_NAME, index_bytes)
+            mapping_sha = _write_durable(tmp_dir / MAPPING_NAME, mapping_bytes)
+            os.replace(tmp_dir, SNAPSHOTS_DIR / name)
+            _fsync_dir(SNAPSHOTS_DIR)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        manifest = {
+            "version": version,
+            "created_at": time.time(),
+            "snapshot": name,
+            "count": len(texts),
+            "dim": index.d,
+            "files": {INDEX_NAME: index_sha, MAPPING_NAME: mapping_sha},
+            "deleted": [],
+            # what to roll back to if this snapshot turns out to be corrupt
+            "previous": {k: v for k, v in current.items() if k != "previous"} if current else None,
+        }
+        _write_manifest(manifest)
+        _prune_snapshots(manifest)
+    return version
+
+def build_index(texts: list[str]):
+    """
+    Embed the given texts and build an in-memory FAISS index over them.
     """
     if not texts:
-        raise ValueError("No texts provided to save_vectorstore.")
+        raise ValueError("No texts provided to build_index.")
     # texts may be a list of strings or a list of dicts with a 'text' key.
     embeddings = [get_embedding(t["text"] if isinstance(t, dict) else t) for t in texts]
     dim = len(embeddings[0])
 
     index = faiss.IndexFlatL2(dim)
     index.add(np.array(embeddings, dtype="float32"))
+    return index
 
-    # persist the original items (strings or dicts) so we can return metadata later
-    with open(MAPPING_FILE, "wb") as f:
-        pickle.dump(texts, f)
-
-    faiss.write_index(index, str(INDEX_FILE))
-
-def query_vectorstore(query: str, top_k: int = 3):
+def save_vectorstore(texts: list[str]):
     """
-    Search FAISS index with query and return top matching texts.
+    Build FAISS index for given texts and persist it to disk as a new snapshot.
     """
+    if not texts:
+        raise ValueError("No texts provided to save_vectorstore.")
+    index = build_index(texts)
+    return _publish_snapshot(index, texts)
+
+def _load_snapshot(manifest: dict, mmap: bool) -> VectorSnapshot:
+    snapshot_dir = SNAPSHOTS_DIR / manifest["snapshot"]
+    for name, expected in manifest["files"].items():
+        try:
+            actual = _sha256_file(snapshot_dir / name)
+        except FileNotFoundError:
+            raise SnapshotCorruptError(f"Vectorstore snapshot {manifest['snapshot']} is missing {name}.")
+        if actual != expected:
+            raise SnapshotCorruptError(f"Vectorstore snapshot {manifest['snapshot']} is corrupt: checksum mismatch for {name}.")
+
+    io_flags = _MMAP_IO_FLAG if mmap else 0
+    index = faiss.read_index(str(snapshot_dir / INDEX_NAME), io_flags)
+    with open(snapshot_dir / MAPPING_NAME, "rb") as f:
+        texts = pickle.load(f)
+    return VectorSnapshot(manifest["version"], manifest["snapshot"], index, texts, set(manifest.get("deleted", [])))
+
+def _load_legacy(mmap: bool) -> VectorSnapshot:
     if not INDEX_FILE.exists() or not MAPPING_FILE.exists():
         raise RuntimeError("Vectorstore not built yet. Please ingest a video first.")
 
-    index = faiss.read_index(str(INDEX_FILE))
+    io_flags = _MMAP_IO_FLAG if mmap else 0
+    index = faiss.read_index(str(INDEX_FILE), io_flags)
     with open(MAPPING_FILE, "rb") as f:
         texts = pickle.load(f)
+    return VectorSnapshot(0, None, index, texts)
 
-    query_vec = np.array([get_embedding(query)], dtype="float32")
-    distances, indices = index.search(query_vec, top_k)
+def _roll_back(bad: dict) -> dict | None:
+    """
+    Publish a new manifest version pointing at the snapshot `bad` replaced.
+    Returns the manifest to load now, or None if there is nothing to roll back to.
+    """
+    previous = bad.get("previous")
+    if not previous:
+        return None
+
+    with _writer_lock():
+        current = _read_manifest()
+        if current is None or current["version"] != bad["version"]:
+            # another process already rolled back or published something newer
+            return current
+        manifest = {**previous, "version": bad["version"] + 1, "created_at": time.time(), "previous": None}
+        _write_manifest(manifest)
+
+    logger.warning(
+        "Vectorstore snapshot %s failed verification; rolled back to snapshot %s as version %d.",
+        bad["snapshot"],
+        previous["snapshot"],
+        manifest["version"],
+    )
+    return manifest
+
+def _load_current(manifest: dict, mmap: bool) -> VectorSnapshot:
+    try:
+        return _load_snapshot(manifest, mmap)
+    except SnapshotCorruptError:
+        rolled_back = _roll_back(manifest)
+        if rolled_back is None:
+            raise
+        return _load_snapshot(rolled_back, mmap)
+
+def load_vectorstore(mmap: bool = False) -> VectorSnapshot:
+    """
+    Return the current snapshot, verifying checksums the first time it is loaded.
+    A snapshot that fails verification is rolled back to the one it replaced.
+    While one caller loads a newly published snapshot, others get the previous one.
+    With `mmap=True` the index is memory-mapped instead of read into memory.
+    """
+    manifest = _read_manifest()
+    version = manifest["version"] if manifest else 0
+
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(mmap)
+        if cached is not None and cached.version == version:
+            return cached
+        if manifest is not None and cached is not None and cached.name == manifest["snapshot"]:
+            # only the deleted set changed; the snapshot files are immutable
+            cached = VectorSnapshot(version, cached.name, cached.index, cached.texts, set(manifest["deleted"]))
+            _snapshot_cache[mmap] = cached
+            return cached
+        # one thread loads the new snapshot; the rest keep answering from the old one
+        if cached is not None and mmap in _snapshot_loading:
+            return cached
+        _snapshot_loading.add(mmap)
+
+    try:
+        # checksumming and reading the index happen outside the lock
+        snapshot = _load_legacy(mmap) if manifest is None else _load_current(manifest, mmap)
+    finally:
+        with _snapshot_lock:
+            _snapshot_loading.discard(mmap)
+
+    with _snapshot_lock:
+        current = _snapshot_cache.get(mmap)
+        if current is None or current.version < snapshot.version:
+            _snapshot_cache[mmap] = snapshot
+    return snapshot
+
+def delete_chunks(chunk_ids: list[int], expected_version: int) -> int:
+    """
+    Mark chunks (positions in the mapping) as deleted and publish a new version.
+    Positions change whenever a snapshot is published, so `expected_version` must be
+    the version the ids were read from (e.g. `load_vectorstore().version`); if the
+    store has moved on, nothing is deleted and a RuntimeError is raised.
+    Deleted chunks are filtered from results immediately; once they make up
+    COMPACTION_THRESHOLD of the index, a background compaction rebuilds it.
+    """
+    with _writer_lock():
+        manifest = _read_manifest()
+        if manifest is None:
+            if INDEX_FILE.exists() and MAPPING_FILE.exists():
+                raise RuntimeError("Vectorstore uses the pre-snapshot layout. Re-ingest the video before deleting chunks.")
+            raise RuntimeError("Vectorstore not built yet. Please ingest a video first.")
+        if manifest["version"] != expected_version:
+            raise RuntimeError(
+                f"Vectorstore changed from version {expected_version} to {manifest['version']}; "
+                "reload it and recompute the chunk ids."
+            )
+
+        deleted = set(manifest.get("deleted", []))
+        deleted.update(i for i in chunk_ids if 0 <= i < manifest["count"])
+        manifest = {**manifest, "version": manifest["version"] + 1, "deleted": sorted(deleted)}
+        _write_manifest(manifest)
+
+    if manifest["count"] and len(deleted) / manifest["count"] >= COMPACTION_THRESHOLD:
+        compact_in_background()
+    return manifest["version"]
 
-    results = []
-    for i in indices[0]:
-        if 0 <= i < len(texts):
-            results.append(texts[i])
-    return results
\ No newline at end of file
+def compact_vectorstore() -> int | None:
+    """
+    Rebuild the index without deleted chunks and publish it as a new snapshot.
+    Queries keep using the previous snapshot until the new one is published. Returns
+    the new version, or None if nothing was deleted or a newer write won the race.
+    """
+    snapshot = load_vectorstore()
+    if not snapshot.deleted:
+        return None
+
+    keep = [i for i in range(snapshot.index.ntotal) if i not in snapshot.deleted]
+    if not keep:
+        raise RuntimeError("Refusing to compact the vectorstore down to zero chunks.")
+
+    vectors = snapshot.index.reconstruct_n(0, snapshot.index.ntotal)[keep]
+    index = faiss.IndexFlatL2(snapshot.index.d)
+    index.add(vectors)
+    texts = [snapshot.texts[i] for i in keep]
+    return _publish_snapshot(index, texts, base_version=snapshot.version)
+
+_compaction_thread: threading.Thread | None = None
+
+def compact_in_background() -> bool:
+    """
+    Start compact_vectorstore in a daemon thread unless one is already running.
+    """
+    global _compaction_thread
+    with _snapshot_lock:
+        if _compaction_thread is not None and _compaction_thread.is_alive():
+            return False
+        _compaction_thread = threading.Thread(target=compact_vectorstore, daemon=True)
+        _compaction_thread.start()
+        return True
+
+def _query_search_server(query_vec: np.ndarray, top_k: int) -> list:
+    """
+    Forward a search to the dedicated search process listening on SEARCH_SOCKET.
+    """
+    try:
+        with Client(SEARCH_SOCKET, family="AF_UNIX") as conn:
+            conn.send({"vector": query_vec, "top_k": top_k})
+            reply = conn.recv()
+    except (OSError, EOFError) as e:
+        raise RuntimeError(f"Search server unavailable at {SEARCH_SOCKET}: {e}")
+
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply["results"]
+
+def query_vectorstore(query: str, top_k: int = 3):
+    """
+    Search FAISS index with query and return top matching texts.
+    When SEARCH_SOCKET is configured the search runs in the shared search process.
+    """
+    if SEARCH_SOCKET:
+        query_vec = np.array(get_embedding(query), dtype="float32")
+        return _query_search_server(query_vec, top_k)
+
+    snapshot = load_vectorstore()
+    query_vec = np.array([get_embedding(query)], dtype="float32")
+    return snapshot.search(query_vec, top_k)[0]
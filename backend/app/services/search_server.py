@@ -0,0 +1,131 @@
+"""Dedicated vector search process.
+
+Owns a single copy of the FAISS index (optionally memory-mapped) and answers
+search requests from API workers over a Unix socket. Requests that arrive within
+SEARCH_BATCH_WINDOW_MS of each other are micro-batched into one `index.search`.
+Each batch is answered from the current vectorstore snapshot, so a new ingest or
+compaction is picked up on the next batch.
+
+Run it from the repo root, then start uvicorn with the same SEARCH_SOCKET:
+    SEARCH_SOCKET=/tmp/ragtube-search.sock python -m backend.app.services.search_server
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Listener
+
+import numpy as np
+
+from backend.app.config import (
+    SEARCH_BATCH_WINDOW_MS,
+    SEARCH_MAX_BATCH,
+    SEARCH_MMAP,
+    SEARCH_SOCKET,
+)
+from backend.app.services.retriever import load_vectorstore
+
+
+class SearchServer:
+    def __init__(
+        self,
+        address: str,
+        batch_window_ms: float = SEARCH_BATCH_WINDOW_MS,
+        max_batch: int = SEARCH_MAX_BATCH,
+        mmap: bool = SEARCH_MMAP,
+    ):
+        self.address = address
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.mmap = mmap
+        self._requests: queue.Queue = queue.Queue()
+
+    def _next_batch(self) -> list:
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _search_batch(self, batch: list):
+        try:
+            # every request in the batch is answered from the same snapshot
+            snapshot = load_vectorstore(mmap=self.mmap)
+
+            pending = []
+            for vector, top_k, future in batch:
+                if vector.shape != (snapshot.index.d,):
+                    future.set_result({"error": f"Query dimension {vector.shape[-1]} does not match index dimension {snapshot.index.d}."})
+                else:
+                    pending.append((vector, top_k, future))
+            if not pending:
+                return
+
+            query_vecs = np.stack([vector for vector, _, _ in pending])
+            k = max(top_k for _, top_k, _ in pending)
+            results = snapshot.search(query_vecs, k)
+
+            for row, (_, top_k, future) in enumerate(pending):
+                future.set_result({"results": results[row][:top_k]})
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result({"error": str(e)})
+
+    def _batch_loop(self):
+        while True:
+            self._search_batch(self._next_batch())
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                future: Future = Future()
+                try:
+                    vector = np.asarray(request["vector"], dtype="float32").reshape(-1)
+                    top_k = int(request.get("top_k", 3))
+                except Exception as e:
+                    future.set_result({"error": f"Malformed search request: {e}"})
+                else:
+                    self._requests.put((vector, top_k, future))
+
+                try:
+                    conn.send(future.result())
+                except OSError:
+                    return
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+        # requests are pickled, so only the owning user may connect; the umask makes
+        # the socket 0600 from the moment it is bound
+        old_umask = os.umask(0o177)
+        try:
+            listener = Listener(self.address, family="AF_UNIX")
+        finally:
+            os.umask(old_umask)
+
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        with listener:
+            print(f"RagTube search server listening on {self.address}")
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    if not SEARCH_SOCKET:
+        raise SystemExit("Set SEARCH_SOCKET to the Unix socket path the search server should listen on.")
+    SearchServer(SEARCH_SOCKET).serve_forever()
@@ -244,11 +244,40 @@ def fetch_transcript(video_url: str) -> str:
     transcript_data = fetch_transcript_data(video_url)
     return transcript_data.get("transcript", "Transcript is empty.")
 
+# Accepted values for chunk_text's `boundary` and `overlap_policy`.
+CHUNK_BOUNDARIES = ("size", "sentence")
+CHUNK_OVERLAP_POLICIES = ("fixed", "boundary", "none")
+# Rough characters-per-token ratio for English text with BPE-style tokenizers.
+_CHARS_PER_TOKEN = 4
+# A "sentence" boundary may only close a chunk once it is at least this full.
+_MIN_CHUNK_FILL = 0.5
+_SENTENCE_END = re.compile(r"[.!?…][\"')\]]*$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of `text` without loading a tokenizer."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def _is_boundary(segments: list[dict], idx: int, pause_seconds: float) -> bool:
+    """True when a chunk may end after segments[idx]: a sentence end or a speech pause."""
+    if _SENTENCE_END.search(segments[idx].get("text", "").strip()):
+        return True
+    if idx + 1 >= len(segments):
+        return True
+    gap = (segments[idx + 1].get("start") or 0.0) - (segments[idx].get("end") or 0.0)
+    return gap >= pause_seconds
+
+
 def chunk_text(
     text: str,
     chunk_size: int = 1000,
     overlap: int = 200,
     segments: list[dict] | None = None,
+    max_tokens: int | None = None,
+    boundary: str = "size",
+    overlap_policy: str = "fixed",
+    pause_seconds: float = 1.0,
 ) -> list:
     """
     Splits text into chunks for embedding.
@@ -257,11 +286,34 @@ def chunk_text(
     adjacent segments so that each chunk is roughly `chunk_size` characters and
     each returned item is a dict: {"text": ..., "start": float, "end": float}.
 
+    If `max_tokens` is set, chunks are sized by estimated tokens instead of characters
+    and `overlap` is counted in tokens as well. `overlap` is capped at half a chunk.
+
+    `boundary` controls where chunks end:
+      - "size": fill each chunk up to the size limit (default).
+      - "sentence": once a chunk is half full, end it at the next sentence end or at a
+        gap of at least `pause_seconds` between cues.
+
+    `overlap_policy` controls how much of a chunk is repeated at the start of the next:
+      - "fixed": step back `overlap` units of segments (default).
+      - "boundary": repeat only the trailing sentence, if it fits within `overlap`.
+      - "none": no overlap.
+
     If `segments` is None, falls back to the original character-based chunking and
     returns a list of strings for backwards compatibility.
     """
     if not text:
         return []
+    if boundary not in CHUNK_BOUNDARIES:
+        raise ValueError(f"Unsupported chunk boundary: {boundary}")
+    if overlap_policy not in CHUNK_OVERLAP_POLICIES:
+        raise ValueError(f"Unsupported overlap policy: {overlap_policy}")
+
+    measure = estimate_tokens if max_tokens else len
+    limit = max_tokens or chunk_size
+    # an overlap close to the chunk size would restart almost every chunk one
+    # segment later, multiplying near-duplicate vectors
+    overlap = 0 if overlap_policy == "none" else min(overlap, limit // 2)
 
     if segments:
         # Chunk by segments and attach timestamp metadata to each chunk.
@@ -269,21 +321,27 @@ def chunk_text(
         n = len(segments)
         idx = 0
         while idx < n:
-            char_count = 0
+            size = 0
             start_idx = idx
             start_time = segments[start_idx].get("start")
             end_time = start_time
             texts: list[str] = []
-            # accumulate segments until chunk_size reached
+            # accumulate segments until the size limit (or a sentence boundary) is reached
             while idx < n:
                 seg_text = segments[idx].get("text", "")
-                seg_len = len(seg_text)
-                if char_count > 0 and char_count + seg_len > chunk_size:
+                seg_len = measure(seg_text)
+                if size > 0 and size + seg_len > limit:
                     break
                 texts.append(seg_text)
-                char_count += seg_len
+                size += seg_len
                 end_time = segments[idx].get("end", end_time)
                 idx += 1
+                if (
+                    boundary == "sentence"
+                    and size >= limit * _MIN_CHUNK_FILL
+                    and _is_boundary(segments, idx - 1, pause_seconds)
+                ):
+                    break
 
             # if a single segment is larger than chunk_size, we still include it
             if not texts and start_idx < n:
@@ -296,20 +354,37 @@ def chunk_text(
             if chunk_text:
                 chunks.append({"text": chunk_text, "start": float(start_time), "end": float(end_time)})
 
-            # implement a simple overlap by moving idx back to include previous segments
-            if overlap and chunks:
-                # compute overlap in characters and step back accordingly
-                back_chars = 0
+            # the last chunk reached the end; stepping back would only emit a subset of it
+            if idx >= n or not overlap or not chunks:
+                continue
+
+            if overlap_policy == "fixed":
+                # compute overlap and step back accordingly
+                back_size = 0
                 back_idx = idx - 1
-                while back_idx >= 0 and back_chars < overlap:
-                    back_chars += len(segments[back_idx].get("text", ""))
+                while back_idx >= 0 and back_size < overlap:
+                    back_size += measure(segments[back_idx].get("text", ""))
                     back_idx -= 1
                 # next start is back_idx + 1, but ensure progress
                 idx = max(back_idx + 1, start_idx + 1)
+            else:
+                # restart at the latest sentence start that keeps the overlap within budget
+                back_size = 0
+                back_idx = idx - 1
+                while back_idx > start_idx:
+                    back_size += measure(segments[back_idx].get("text", ""))
+                    if back_size > overlap:
+                        break
+                    if _is_boundary(segments, back_idx - 1, pause_seconds):
+                        idx = back_idx
+                        break
+                    back_idx -= 1
 
         return chunks
 
     # fallback: original character-based splitting
+    if max_tokens:
+        chunk_size = max_tokens * _CHARS_PER_TOKEN
     chunks: list[str] = []
     start = 0
     text_len = len(text)